@@ -0,0 +1,110 @@
+"""Tests for the audio pipeline of the event handler"""
+# pylint: disable=protected-access
+import argparse
+import time
+from typing import List, Optional
+
+import pytest
+from wyoming.audio import AudioChunk, AudioStart, AudioStop
+from wyoming.event import Event
+from wyoming.info import Info
+from wyoming.wake import NotDetected
+
+from wyoming_porcupine1.__main__ import Detector, Porcupine1EventHandler, State
+
+_CHUNK = AudioChunk(rate=16000, width=2, channels=1, audio=bytes(1024))
+
+
+def _make_handler() -> Porcupine1EventHandler:
+    handler = Porcupine1EventHandler(
+        Info().event(),
+        argparse.Namespace(sensitivity=0.5),
+        State(pv_lib_paths={}, keywords={}),
+        None,
+        None,
+    )
+
+    # Skip loading a real detector
+    handler.detector = Detector(
+        porcupine=None, sensitivity=0.5, keyword_paths=(), names=[]
+    )
+    handler.bytes_per_chunk = 1024
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_error_ends_connection_on_audio_chunk() -> None:
+    handler = _make_handler()
+
+    def process_frames() -> Optional[int]:
+        raise RuntimeError("process failed")
+
+    handler._process_frames = process_frames  # type: ignore[assignment]
+
+    assert await handler.handle_event(AudioStart(16000, 2, 1).event())
+    assert await handler.handle_event(_CHUNK.event())
+    await handler._queue.join()
+
+    with pytest.raises(RuntimeError, match="process failed"):
+        await handler.handle_event(_CHUNK.event())
+
+    await handler.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_error_ends_connection_on_audio_stop() -> None:
+    handler = _make_handler()
+    written: List[Event] = []
+
+    async def write_event(event: Event) -> None:
+        written.append(event)
+
+    def process_frames() -> Optional[int]:
+        raise RuntimeError("process failed")
+
+    handler.write_event = write_event  # type: ignore[assignment]
+    handler._process_frames = process_frames  # type: ignore[assignment]
+
+    assert await handler.handle_event(AudioStart(16000, 2, 1).event())
+    assert await handler.handle_event(_CHUNK.event())
+
+    with pytest.raises(RuntimeError, match="process failed"):
+        await handler.handle_event(AudioStop().event())
+
+    # Failure must not look like "no wake word"
+    assert not any(NotDetected.is_type(event.type) for event in written)
+
+    await handler.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_audio_stop_waits_for_queued_audio() -> None:
+    handler = _make_handler()
+    num_chunks = 20
+    processed: List[int] = []
+    written: List[Event] = []
+
+    async def write_event(event: Event) -> None:
+        written.append(event)
+
+    def process_frames() -> None:
+        time.sleep(0.005)
+        processed.append(len(processed))
+
+    handler.write_event = write_event  # type: ignore[assignment]
+    handler._process_frames = process_frames  # type: ignore[assignment]
+
+    assert await handler.handle_event(AudioStart(16000, 2, 1).event())
+    for _ in range(num_chunks):
+        assert await handler.handle_event(_CHUNK.event())
+
+    # Consumer can't have kept up with the slow detector
+    assert len(processed) < num_chunks
+
+    await handler.handle_event(AudioStop().event())
+    assert len(processed) == num_chunks
+    assert len(written) == 1
+    assert NotDetected.is_type(written[0].type)
+
+    await handler.disconnect()
@@ -0,0 +1,64 @@
+"""Tests for scanning and indexing models"""
+import shutil
+from pathlib import Path
+
+from wyoming_porcupine1.__main__ import _INDEX_NAME, load_models
+
+_DIR = Path(__file__).parent
+_DATA_DIR = _DIR.parent / "wyoming_porcupine1" / "data"
+
+
+def test_load_models(tmp_path: Path) -> None:
+    shutil.copytree(_DATA_DIR / "lib", tmp_path / "lib")
+    shutil.copytree(
+        _DATA_DIR / "resources" / "en" / "linux",
+        tmp_path / "resources" / "en" / "linux",
+    )
+
+    pv_lib_paths, keywords = load_models(tmp_path, "linux")
+    assert (tmp_path / _INDEX_NAME).is_file()
+    assert pv_lib_paths["en"] == tmp_path / "lib" / "common" / "porcupine_params_en.pv"
+    assert keywords["porcupine"].language == "en"
+    assert keywords["porcupine"].model_path == (
+        tmp_path / "resources" / "en" / "linux" / "porcupine_linux.ppn"
+    )
+
+    # Loaded from index
+    assert load_models(tmp_path, "linux") == (pv_lib_paths, keywords)
+
+    # Index is per system
+    _, rpi_keywords = load_models(tmp_path, "raspberry-pi")
+    assert not rpi_keywords
+
+
+def test_load_models_missing_dir_added(tmp_path: Path) -> None:
+    shutil.copytree(_DATA_DIR / "lib", tmp_path / "lib")
+
+    _, keywords = load_models(tmp_path, "linux")
+    assert not keywords
+    assert (tmp_path / _INDEX_NAME).is_file()
+
+    # Adding a directory that was missing must invalidate the index
+    shutil.copytree(
+        _DATA_DIR / "resources" / "en" / "linux",
+        tmp_path / "resources" / "en" / "linux",
+    )
+
+    _, keywords = load_models(tmp_path, "linux")
+    assert "porcupine" in keywords
+
+
+def test_load_models_symlink_loop(tmp_path: Path) -> None:
+    shutil.copytree(_DATA_DIR / "lib", tmp_path / "lib")
+    shutil.copytree(
+        _DATA_DIR / "resources" / "en" / "linux",
+        tmp_path / "resources" / "en" / "linux",
+    )
+
+    # Symlinked directories are not followed
+    (tmp_path / "resources" / "en" / "loop").symlink_to(tmp_path / "resources")
+
+    _, keywords = load_models(tmp_path, "linux")
+    assert keywords["porcupine"].model_path == (
+        tmp_path / "resources" / "en" / "linux" / "porcupine_linux.ppn"
+    )
@@ -0,0 +1,100 @@
+"""Tests for loading and caching detectors"""
+# pylint: disable=protected-access
+import asyncio
+import threading
+import time
+from pathlib import Path
+from typing import Any, List
+
+import pvporcupine
+import pytest
+
+from wyoming_porcupine1.__main__ import Keyword, State
+
+_NUM_CLIENTS = 5
+
+
+class FakeCreate:
+    """Slow stand-in for pvporcupine.create that tracks concurrent calls."""
+
+    def __init__(self, fail_first: bool = False) -> None:
+        self.fail_first = fail_first
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, **kwargs: Any) -> object:
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+
+        try:
+            time.sleep(0.02)
+            if self.fail_first and (call == 1):
+                raise ValueError("create failed")
+
+            return object()
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+def _make_state() -> State:
+    return State(
+        pv_lib_paths={"en": Path("porcupine_params_en.pv")},
+        keywords={
+            "porcupine": Keyword(
+                language="en",
+                name="porcupine",
+                model_path=Path("porcupine_linux.ppn"),
+            )
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake_create = FakeCreate()
+    monkeypatch.setattr(pvporcupine, "create", fake_create)
+    state = _make_state()
+
+    detectors = await asyncio.wait_for(
+        asyncio.gather(*(state.get_porcupine(0.5) for _ in range(_NUM_CLIENTS))),
+        timeout=5,
+    )
+
+    # Loads for the same key never overlap
+    assert fake_create.max_running == 1
+    assert fake_create.calls == _NUM_CLIENTS
+
+    # Every client has its own detector
+    assert len({id(d.porcupine) for d in detectors}) == _NUM_CLIENTS
+    assert detectors[0].names == ["porcupine"]
+    assert not state._inflight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake_create = FakeCreate(fail_first=True)
+    monkeypatch.setattr(pvporcupine, "create", fake_create)
+    state = _make_state()
+
+    results: List[Any] = await asyncio.wait_for(
+        asyncio.gather(
+            *(state.get_porcupine(0.5) for _ in range(_NUM_CLIENTS)),
+            return_exceptions=True,
+        ),
+        timeout=5,
+    )
+
+    # Only the failed load raises, waiters retry instead of hanging
+    errors = [r for r in results if isinstance(r, Exception)]
+    detectors = [r for r in results if not isinstance(r, Exception)]
+    assert len(errors) == 1
+    assert isinstance(errors[0], ValueError)
+    assert len({id(d.porcupine) for d in detectors}) == _NUM_CLIENTS - 1
+    assert fake_create.max_running == 1
+    assert not state._inflight
@@ -1,18 +1,33 @@
 #!/usr/bin/env python3
 import argparse
 import asyncio
+import contextlib
+import ctypes
+import itertools
+import json
 import logging
+import os
 import platform
 import struct
-import time
 from pprint import pformat
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
-import pvporcupine
 from wyoming.audio import AudioChunk, AudioChunkConverter, AudioStart, AudioStop
 from wyoming.event import Event
 from wyoming.info import Attribution, Describe, Info, WakeModel, WakeProgram
@@ -21,11 +36,26 @@ from wyoming.wake import Detect, Detection, NotDetected
 
 from . import __version__
 
+if TYPE_CHECKING:
+    import pvporcupine
+
 _LOGGER = logging.getLogger()
 _DIR = Path(__file__).parent
 
 DEFAULT_KEYWORD = "porcupine"
 
+# Cached results of scanning the data directory for models
+_INDEX_NAME = ".index.json"
+
+# Bytes of consumed audio kept before compacting the buffer
+_MAX_READ_POS = 65536
+
+# Source of unique client ids
+_CLIENT_IDS = itertools.count()
+
+# Audio chunks waiting to be processed before a client is slowed down
+_MAX_QUEUED_CHUNKS = 8
+
 
 @dataclass
 class Keyword:
@@ -38,8 +68,20 @@ class Keyword:
 
 @dataclass
 class Detector:
-    porcupine: pvporcupine.Porcupine
+    porcupine: "pvporcupine.Porcupine"
     sensitivity: float
+    keyword_paths: Tuple[str, ...]
+
+    # Keyword name for each index returned by porcupine.process
+    names: List[str]
+
+    @property
+    def cache_key(self) -> "DetectorKey":
+        return (self.sensitivity, self.keyword_paths)
+
+
+# (sensitivity, sorted keyword paths)
+DetectorKey = Tuple[float, Tuple[str, ...]]
 
 
 class State:
@@ -49,51 +91,203 @@ class State:
         self.pv_lib_paths = pv_lib_paths
         self.keywords = keywords
 
-        # keyword name -> [detector]
-        self.detector_cache: Dict[str, List[Detector]] = defaultdict(list)
+        # language -> [keyword path]
+        self._lang_keyword_paths: Dict[str, List[str]] = defaultdict(list)
+
+        # keyword path -> keyword name
+        self._keyword_names: Dict[str, str] = {}
+
+        for keyword in keywords.values():
+            self._lang_keyword_paths[keyword.language].append(str(keyword.model_path))
+            self._keyword_names[str(keyword.model_path)] = keyword.name
+
+        # (sensitivity, keyword paths) -> [detector]
+        self.detector_cache: Dict[DetectorKey, List[Detector]] = defaultdict(list)
         self.detector_lock = asyncio.Lock()
 
+        # (sensitivity, keyword paths) -> load in progress
+        self._inflight: Dict[DetectorKey, "asyncio.Future[None]"] = {}
+
     # We set only one keyword_name here, could be multiple
     async def get_porcupine(self, sensitivity: float) -> Detector:
+        # Loading the native library is slow, so wait until a detector is needed
+        import pvporcupine  # pylint: disable=import-outside-toplevel
+
         if self.keywords is None:
             _LOGGER.debug("No keywords")
             raise ValueError(f"No keywords")
 
-        # Check cache first for matching detector
-        # async with self.detector_lock:
-        #     detectors = self.detector_cache.get(keyword_name)
-        #     if detectors:
-        #         detector = next(
-        #             (d for d in detectors if d.sensitivity == sensitivity), None
-        #         )
-        #         if detector is not None:
-        #             # Remove from cache for use
-        #             detectors.remove(detector)
-
-        #             _LOGGER.debug(
-        #                 "Using detector for %s from cache (%s)",
-        #                 keyword_name,
-        #                 len(detectors),
-        #             )
-        #             return detector
-
-        # _LOGGER.debug("Loading %s for %s", keyword.name, keyword.language)
-        # We just set one keyword in keyword_paths, could be multiple
-        keywords_paths = []
-
         # /!\ On ne peut charger QUE des path dont le language est le même que celui de la lib utilisé, sinon on a une ValueError
-        for keyword in self.keywords:
-            if (self.keywords[keyword].language == "en"):
-                keywords_paths.append(str(self.keywords[keyword].model_path))
-        _LOGGER.debug("pv_lib_path: %s \n keywords_path %s", pformat(self.pv_lib_paths), pformat(str(keywords_paths[0])))
-        porcupine = pvporcupine.create(
-            model_path=str(self.pv_lib_paths["en"]),
-            # keyword_paths=[str(self.keywords['alexa'].model_path), str(self.keywords['computer'].model_path)],
-            keyword_paths=keywords_paths,
-            # sensitivities=[sensitivity] * len(keywords_paths),
+        keywords_paths = self._lang_keyword_paths["en"]
+
+        key: DetectorKey = (sensitivity, tuple(sorted(keywords_paths)))
+
+        while True:
+            # Check cache first for matching detector
+            async with self.detector_lock:
+                detectors = self.detector_cache.get(key)
+                if detectors:
+                    # Remove from cache for use
+                    detector = detectors.pop()
+                    _LOGGER.debug("Using detector from cache (%s)", len(detectors))
+                    return detector
+
+                inflight = self._inflight.get(key)
+                if inflight is None:
+                    # We are the ones loading this detector
+                    inflight = asyncio.get_running_loop().create_future()
+                    self._inflight[key] = inflight
+                    break
+
+            # Another client is loading a detector for the same key.
+            # Wait for it to finish, then check the cache again instead of
+            # loading models concurrently.
+            _LOGGER.debug("Waiting for detector already being loaded")
+            await asyncio.wait([inflight])
+
+        try:
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "pv_lib_path: %s \n keywords_path %s",
+                    pformat(self.pv_lib_paths),
+                    pformat(str(keywords_paths[0])),
+                )
+
+            porcupine = await asyncio.get_running_loop().run_in_executor(
+                None,
+                partial(
+                    pvporcupine.create,
+                    model_path=str(self.pv_lib_paths["en"]),
+                    # keyword_paths=[str(self.keywords['alexa'].model_path), str(self.keywords['computer'].model_path)],
+                    keyword_paths=list(key[1]),
+                    # sensitivities=[sensitivity] * len(keywords_paths),
+                ),
+            )
+        finally:
+            async with self.detector_lock:
+                self._inflight.pop(key, None)
+
+            inflight.set_result(None)
+
+        return Detector(
+            porcupine,
+            sensitivity,
+            key[1],
+            names=[self._keyword_names[path] for path in key[1]],
         )
 
-        return Detector(porcupine, sensitivity)
+
+def load_models(
+    data_dir: Path, system: str
+) -> Tuple[Dict[str, Path], Dict[str, Keyword]]:
+    """Load model paths from the index in data_dir, scanning only if it is stale."""
+    index_path = data_dir / _INDEX_NAME
+    try:
+        with open(index_path, "r", encoding="utf-8") as index_file:
+            index = json.load(index_file)
+
+        if (index.get("system") == system) and all(
+            _get_mtime_ns(dir_path) == mtime_ns
+            for dir_path, mtime_ns in index["mtimes"].items()
+        ):
+            _LOGGER.debug("Using model index: %s", index_path)
+            return (
+                {lang: Path(path) for lang, path in index["pv_lib_paths"].items()},
+                {
+                    kw["name"]: Keyword(
+                        language=kw["language"],
+                        name=kw["name"],
+                        model_path=Path(kw["model_path"]),
+                    )
+                    for kw in index["keywords"]
+                },
+            )
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+
+    _LOGGER.debug("Scanning models in %s", data_dir)
+
+    # directory -> mtime (None if missing)
+    mtimes: Dict[str, Optional[int]] = {}
+
+    # lang -> path
+    pv_lib_paths: Dict[str, Path] = {}
+    lib_dir = data_dir / "lib" / "common"
+    for lib_path in _scan_files(lib_dir, ".pv", mtimes, recursive=False):
+        lib_lang = lib_path.stem.split("_")[-1]
+        pv_lib_paths[lib_lang] = lib_path
+
+    # name -> keyword
+    keywords: Dict[str, Keyword] = {}
+    for kw_path in _scan_files(data_dir / "resources", ".ppn", mtimes):
+        kw_system = kw_path.stem.split("_")[-1]
+        if kw_system != system:
+            continue
+
+        kw_lang = kw_path.parent.parent.name
+        kw_name = kw_path.stem.rsplit("_", maxsplit=1)[0]
+        keywords[kw_name] = Keyword(language=kw_lang, name=kw_name, model_path=kw_path)
+
+    try:
+        with open(index_path, "w", encoding="utf-8") as index_file:
+            json.dump(
+                {
+                    "system": system,
+                    "mtimes": mtimes,
+                    "pv_lib_paths": {
+                        lang: str(path) for lang, path in pv_lib_paths.items()
+                    },
+                    "keywords": [
+                        {
+                            "language": kw.language,
+                            "name": kw.name,
+                            "model_path": str(kw.model_path),
+                        }
+                        for kw in keywords.values()
+                    ],
+                },
+                index_file,
+            )
+    except OSError:
+        # Data directory may be read-only
+        _LOGGER.debug("Unable to write model index: %s", index_path)
+
+    return pv_lib_paths, keywords
+
+
+def _scan_files(
+    dir_path: Path,
+    suffix: str,
+    mtimes: Dict[str, Optional[int]],
+    recursive: bool = True,
+) -> Iterable[Path]:
+    """Yield files ending with suffix, recording the mtime of each directory."""
+    dir_paths = [dir_path]
+    while dir_paths:
+        current_dir = dir_paths.pop()
+
+        # Missing directories are recorded too, so adding them later is noticed
+        mtimes[str(current_dir)] = _get_mtime_ns(current_dir)
+        try:
+            with os.scandir(current_dir) as entries:
+                for entry in entries:
+                    # Don't follow symlinked directories, like Path.rglob
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            dir_paths.append(Path(entry.path))
+                    elif entry.name.endswith(suffix):
+                        yield Path(entry.path)
+        except OSError:
+            # Missing or unreadable
+            continue
+
+
+def _get_mtime_ns(path: Union[str, Path]) -> Optional[int]:
+    """Get modification time of a path, or None if it can't be read."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
 
 
 async def main() -> None:
@@ -132,27 +326,9 @@ async def main() -> None:
 
     args.data_dir = Path(args.data_dir)
 
-    # lang -> path
-    pv_lib_paths: Dict[str, Path] = {}
-    for lib_path in (args.data_dir / "lib" / "common").glob("*.pv"):
-        lib_lang = lib_path.stem.split("_")[-1]
-        pv_lib_paths[lib_lang] = lib_path
-
-    # name -> keyword
-    keywords: Dict[str, Keyword] = {}
-    _LOGGER.debug('Files pattern ppn')
-    _LOGGER.debug((args.data_dir / "resources").rglob("*.ppn"))
-    for kw_path in (args.data_dir / "resources").rglob("*.ppn"):
-        kw_system = kw_path.stem.split("_")[-1]
-        if kw_system != args.system:
-            continue
-
-        kw_lang = kw_path.parent.parent.name
-        kw_name = kw_path.stem.rsplit("_", maxsplit=1)[0]
-        keywords[kw_name] = Keyword(language=kw_lang, name=kw_name, model_path=kw_path)
+    pv_lib_paths, keywords = load_models(args.data_dir, args.system)
 
-    _LOGGER.debug('List of keywords')
-    _LOGGER.debug(keywords)
+    _LOGGER.debug("List of keywords: %s", keywords)
     wyoming_info = Info(
         wake=[
             WakeProgram(
@@ -182,6 +358,8 @@ async def main() -> None:
         ],
     )
 
+    wyoming_info_event = wyoming_info.event()
+
     # PV lib paths is all the path of the files ending with .pv
     # Keywords is all the keywords loaded with .ppn files
     state = State(pv_lib_paths=pv_lib_paths, keywords=keywords)
@@ -193,7 +371,9 @@ async def main() -> None:
 
     try:
         # The run function is this one https://github.com/rhasspy/wyoming/blob/e61742fc40690a7a66c3c1fbcf5fee665a633189/wyoming/server.py#L31
-        await server.run(partial(Porcupine1EventHandler, wyoming_info, args, state))
+        await server.run(
+            partial(Porcupine1EventHandler, wyoming_info_event, args, state)
+        )
     except KeyboardInterrupt:
         pass
 
@@ -205,7 +385,7 @@ class Porcupine1EventHandler(AsyncEventHandler):
 
     def __init__(
         self,
-        wyoming_info: Info,
+        wyoming_info_event: Event,
         cli_args: argparse.Namespace,
         state: State,
         *args,
@@ -214,17 +394,42 @@ class Porcupine1EventHandler(AsyncEventHandler):
         super().__init__(*args, **kwargs)
 
         self.cli_args = cli_args
-        self.wyoming_info_event = wyoming_info.event()
-        self.client_id = str(time.monotonic_ns())
+        self.wyoming_info_event = wyoming_info_event
+        self.client_id = str(next(_CLIENT_IDS))
         self.state = state
         self.converter = AudioChunkConverter(rate=16000, width=2, channels=1)
-        self.audio_buffer = bytes()
+        self._target = (
+            self.converter.rate,
+            self.converter.width,
+            self.converter.channels,
+        )
+        self.audio_buffer = bytearray()
+        self._read_pos = 0
         self.detected = False
 
         self.detector: Optional[Detector] = None
         self.chunk_format: str = ""
+        self._chunk_struct = struct.Struct(self.chunk_format)
+        self._chunk_unpack_from = self._chunk_struct.unpack_from
         self.bytes_per_chunk: int = 0
 
+        # Frames are handed directly to the native library
+        self._pcm_type: Type[ctypes.Array] = ctypes.c_short * 0
+        self._pcm_result = ctypes.c_int()
+        self._pcm_result_ref = ctypes.byref(self._pcm_result)
+        # (process function, handle, success status, status -> exception)
+        self._native_process: Optional[Tuple[Callable[..., Any], Any, Any, Any]] = None
+
+        # Runs Porcupine off of the event loop
+        self._pool = ThreadPoolExecutor(max_workers=1)
+
+        # Audio is processed in order by a separate task
+        self._queue: "asyncio.Queue[AudioChunk]" = asyncio.Queue(
+            maxsize=_MAX_QUEUED_CHUNKS
+        )
+        self._error: Optional[Exception] = None
+        self._worker = asyncio.create_task(self._consume())
+
         _LOGGER.debug("Client connected: %s", self.client_id)
 
     async def handle_event(self, event: Event) -> bool:
@@ -243,6 +448,7 @@ class Porcupine1EventHandler(AsyncEventHandler):
                 await self._load_keyword()
         elif AudioStart.is_type(event.type):
             _LOGGER.debug("Audio just start. Detected pass to false")
+            await self._queue.join()
             self.detected = False
         elif AudioChunk.is_type(event.type):
             _LOGGER.debug("Audio chuck type")
@@ -252,48 +458,17 @@ class Porcupine1EventHandler(AsyncEventHandler):
                 await self._load_keyword()
 
             assert self.detector is not None
+            self._raise_if_failed()
 
-            chunk = AudioChunk.from_event(event)
-            chunk = self.converter.convert(chunk)
-            self.audio_buffer += chunk.audio
-
-            while len(self.audio_buffer) >= self.bytes_per_chunk:
-                unpacked_chunk = struct.unpack_from(
-                    self.chunk_format, self.audio_buffer[: self.bytes_per_chunk]
-                )
-                # for detector in self.detectors:
-                #   keyword_index = detector.porcupine.process(unpacked_chunk)
-                #   _LOGGER.debug("Keyword index in loop %d", keyword_index)
-                #   if keyword_index >= 0:
-                #       _LOGGER.debug("Detected keyword %s", detector.keyword)
-                #       # You can add additional logic here to handle the detected keyword
-                #       await self.write_event(
-                #         Detection(
-                #             name=detector.keyword, timestamp=chunk.timestamp
-                #         ).event()
-                #       )
-
-                # Here we get the result of the actual detected keywords
-                # That could look something like that actually https://github.com/Picovoice/porcupine/blob/1462f5c8c7a8985fca50eec350deaef973407e67/demo/python/porcupine_demo_file.py#L138
-                keyword_index = self.detector.porcupine.process(unpacked_chunk)
-                _LOGGER.debug("Keyword index in loop %d", keyword_index)
-                if keyword_index >= 0:
-                    # TODO: add logic here to handle the detected keyword
-                    # _LOGGER.debug("Detected %s from client %s", self.state.keywords[keyword_index].name, self.client_id)
-                    # Here we may need to write an event like here for detection of assistant needed
-                    # Or an event on mqtt for wake words who will do an action
-                    # If we can do something in config for that, awesome, but first, let's get it work
-                    await self.write_event(
-                        Detection(
-                          # TODO: remove hard coded value
-                            name='alexa', timestamp=chunk.timestamp
-                        ).event()
-                    )
-
-                self.audio_buffer = self.audio_buffer[self.bytes_per_chunk :]
-
+            # Blocks when the consumer falls behind
+            await self._queue.put(AudioChunk.from_event(event))
         elif AudioStop.is_type(event.type):
             _LOGGER.debug("Audio stop")
+
+            # Wait for queued audio to be processed
+            await self._queue.join()
+            self._raise_if_failed()
+
             # Inform client if not detections occurred
             if not self.detected:
                 _LOGGER.debug("Nothing was detected")
@@ -311,25 +486,183 @@ class Porcupine1EventHandler(AsyncEventHandler):
     async def disconnect(self) -> None:
         _LOGGER.debug("Client disconnected: %s", self.client_id)
 
+        self._worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._worker
+
+        # Wait for any frames still being processed before the detector is reused
+        await asyncio.get_running_loop().run_in_executor(None, self._pool.shutdown)
+        await self._release_detector()
+
+    async def _release_detector(self) -> None:
         if self.detector is not None:
             # Return detector to cache
             async with self.state.detector_lock:
-                # self.state.detector_cache[self.keyword_name].append(self.detector)
+                detectors = self.state.detector_cache[self.detector.cache_key]
+                detectors.append(self.detector)
                 self.detector = None
-                # _LOGGER.debug(
-                #     "Detector for %s returned to cache (%s)",
-                #     self.keyword_name,
-                #     len(self.state.detector_cache[self.keyword_name]),
-                # )
+                _LOGGER.debug("Detector returned to cache (%s)", len(detectors))
 
     async def _load_keyword(self):
+        # Don't swap detectors while queued audio is still being processed
+        await self._queue.join()
+
+        # Don't leak a previously loaded detector
+        await self._release_detector()
+
         # Here we set self.detector, this could be self.detectors
         self.detector = await self.state.get_porcupine(
             self.cli_args.sensitivity
         )
-        self.chunk_format = "h" * self.detector.porcupine.frame_length
+        self.chunk_format = f"{self.detector.porcupine.frame_length}h"
+        self._chunk_struct = struct.Struct(self.chunk_format)
+        self._chunk_unpack_from = self._chunk_struct.unpack_from
         self.bytes_per_chunk = self.detector.porcupine.frame_length * 2
 
+        self._pcm_type = ctypes.c_short * self.detector.porcupine.frame_length
+
+        # Calling the native library directly relies on pvporcupine 1.9 internals.
+        # Fall back to the public API if any of them are missing.
+        porcupine = self.detector.porcupine
+        try:
+            # pylint: disable=protected-access
+            self._native_process = (
+                porcupine.process_func,
+                porcupine._handle,
+                porcupine.PicovoiceStatuses.SUCCESS,
+                porcupine._PICOVOICE_STATUS_TO_EXCEPTION,
+            )
+        except AttributeError:
+            _LOGGER.debug("Using public Porcupine API")
+            self._native_process = None
+
+    async def _consume(self) -> None:
+        """Process queued audio chunks in order."""
+        while True:
+            chunk = await self._queue.get()
+            try:
+                if self._error is not None:
+                    # Processing failed, drop audio until the error is raised
+                    continue
+
+                if self.detected:
+                    # Already detected in this session, skip the rest of the audio
+                    del self.audio_buffer[:]
+                    self._read_pos = 0
+                    continue
+
+                if (chunk.rate, chunk.width, chunk.channels) != self._target:
+                    chunk = self.converter.convert(chunk)
+
+                self.audio_buffer.extend(chunk.audio)
+
+                # Porcupine releases the GIL, so other clients keep being served
+                keyword_index = await asyncio.get_running_loop().run_in_executor(
+                    self._pool, self._process_frames
+                )
+
+                # for detector in self.detectors:
+                #   keyword_index = detector.porcupine.process(unpacked_chunk)
+                #   _LOGGER.debug("Keyword index in loop %d", keyword_index)
+                #   if keyword_index >= 0:
+                #       _LOGGER.debug("Detected keyword %s", detector.keyword)
+                #       # You can add additional logic here to handle the detected keyword
+                #       await self.write_event(
+                #         Detection(
+                #             name=detector.keyword, timestamp=chunk.timestamp
+                #         ).event()
+                #       )
+                if keyword_index is not None:
+                    self.detected = True
+
+                    assert self.detector is not None
+                    keyword_name = self.detector.names[keyword_index]
+                    _LOGGER.debug(
+                        "Detected %s from client %s", keyword_name, self.client_id
+                    )
+                    # Here we may need to write an event like here for detection of assistant needed
+                    # Or an event on mqtt for wake words who will do an action
+                    # If we can do something in config for that, awesome, but first, let's get it work
+                    await self.write_event(
+                        Detection(name=keyword_name, timestamp=chunk.timestamp).event()
+                    )
+
+                if self._read_pos > _MAX_READ_POS:
+                    # Compact consumed audio
+                    del self.audio_buffer[: self._read_pos]
+                    self._read_pos = 0
+            except Exception as err:
+                # Raised from handle_event to end the connection
+                self._error = err
+            finally:
+                self._queue.task_done()
+
+    def _raise_if_failed(self) -> None:
+        """Raise the error that stopped audio processing, if any."""
+        if self._error is not None:
+            raise self._error
+
+    def _process_frames(self) -> Optional[int]:
+        """Process complete frames in the audio buffer until a keyword is detected.
+
+        Returns the index of the detected keyword, if any.
+        """
+        assert self.detector is not None
+        porcupine = self.detector.porcupine
+        audio_buffer = self.audio_buffer
+        bytes_per_chunk = self.bytes_per_chunk
+        last_pos = len(audio_buffer) - bytes_per_chunk
+        read_pos = self._read_pos
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        keyword_index = -1
+
+        # Here we get the result of the actual detected keywords
+        # That could look something like that actually https://github.com/Picovoice/porcupine/blob/1462f5c8c7a8985fca50eec350deaef973407e67/demo/python/porcupine_demo_file.py#L138
+        native_process = self._native_process
+        if native_process is None:
+            # Fall back to the public API, which copies samples through a tuple
+            process = porcupine.process
+            unpack_from = self._chunk_unpack_from
+            while read_pos <= last_pos:
+                keyword_index = process(unpack_from(audio_buffer, read_pos))
+                read_pos += bytes_per_chunk
+                if debug:
+                    _LOGGER.debug("Keyword index in loop %d", keyword_index)
+
+                if keyword_index >= 0:
+                    break
+        else:
+            process_func, handle, success, status_errors = native_process
+            pcm_from_buffer = self._pcm_type.from_buffer
+            result = self._pcm_result
+            result_ref = self._pcm_result_ref
+            pcm = None
+            try:
+                while read_pos <= last_pos:
+                    # Zero-copy view of the samples in the audio buffer
+                    pcm = pcm_from_buffer(audio_buffer, read_pos)
+                    status = process_func(handle, pcm, result_ref)
+                    if status is not success:
+                        raise status_errors[status]()
+
+                    keyword_index = result.value
+                    read_pos += bytes_per_chunk
+                    if debug:
+                        _LOGGER.debug("Keyword index in loop %d", keyword_index)
+
+                    if keyword_index >= 0:
+                        break
+            finally:
+                # The audio buffer can't be resized while it is exported
+                pcm = None
+
+        self._read_pos = read_pos
+        if keyword_index >= 0:
+            return keyword_index
+
+        return None
+
+
 # -----------------------------------------------------------------------------
 
 